@@ -0,0 +1,46 @@
+def create_test_species_data():
+    """Create the template species data and new species for tests."""
+    species_data = {
+        "SP001": {"name": "Bengal Tiger", "scientific_name": "Panthera tigris tigris",
+                  "conservation_status": "Endangered", "population": 3500, "habitat_type": "Forest",
+                  "sanctuaries": ["Sundarbans", "Jim Corbett", "Bandhavgarh"],
+                  "threats": ["Poaching", "Habitat Loss", "Human Conflict"]},
+        "SP002": {"name": "Asian Elephant", "scientific_name": "Elephas maximus",
+                  "conservation_status": "Endangered", "population": 27000, "habitat_type": "Forest",
+                  "sanctuaries": ["Periyar", "Nagarhole", "Jim Corbett"],
+                  "threats": ["Habitat Loss", "Human Conflict", "Poaching"]},
+        "SP003": {"name": "Indian Rhinoceros", "scientific_name": "Rhinoceros unicornis",
+                  "conservation_status": "Vulnerable", "population": 3600, "habitat_type": "Grassland",
+                  "sanctuaries": ["Kaziranga", "Manas", "Orang"],
+                  "threats": ["Poaching", "Habitat Loss", "Flooding"]},
+        "SP004": {"name": "Snow Leopard", "scientific_name": "Panthera uncia",
+                  "conservation_status": "Vulnerable", "population": 450, "habitat_type": "Mountain",
+                  "sanctuaries": ["Hemis", "Pin Valley", "Great Himalayan"],
+                  "threats": ["Climate Change", "Poaching", "Prey Depletion"]},
+        "SP005": {"name": "Indian Vulture", "scientific_name": "Gyps indicus",
+                  "conservation_status": "Critically Endangered", "population": 30000, "habitat_type": "Grassland",
+                  "sanctuaries": ["Ranthambore", "Pench", "Bandhavgarh"],
+                  "threats": ["Diclofenac Poisoning", "Habitat Loss", "Food Scarcity"]},
+    }
+    new_species = {
+        "NS001": {"name": "Ganges River Dolphin", "scientific_name": "Platanista gangetica",
+                  "conservation_status": "Endangered", "population": 3500, "habitat_type": "Wetland",
+                  "sanctuaries": ["Vikramshila", "National Chambal", "Katerniaghat"],
+                  "threats": ["Water Pollution", "Fishing Nets", "Dams"]},
+        "NS002": {"name": "Great Indian Bustard", "scientific_name": "Ardeotis nigriceps",
+                  "conservation_status": "Critically Endangered", "population": 150, "habitat_type": "Grassland",
+                  "sanctuaries": ["Desert National Park", "Kutch Bustard", "Rollapadu"],
+                  "threats": ["Habitat Loss", "Power Lines", "Predation"]},
+    }
+    return species_data, new_species
+
+def create_unrelated_species_data():
+    """Create a dataset sharing IDs with the template data but not its records."""
+    return {
+        "SP001": {"name": "Blue Whale", "scientific_name": "Balaenoptera musculus",
+                  "conservation_status": "Endangered", "population": 9000, "habitat_type": "Ocean",
+                  "sanctuaries": ["Nowhere"], "threats": ["Shipping"]},
+        "x1": {"name": "Sea Otter", "scientific_name": "Enhydra lutris",
+               "conservation_status": "Endangered", "population": 300, "habitat_type": "Ocean",
+               "sanctuaries": ["Nowhere"], "threats": ["Oil Spills"]},
+    }
@@ -0,0 +1,99 @@
+import contextlib
+import io
+import os
+import sys
+import tempfile
+import unittest
+import skeleton
+from test.species_fixtures import create_test_species_data
+
+def run_captured(function, *args, stdin=""):
+    """Run a function with the given standard input and return what it printed."""
+    output = io.StringIO()
+    with contextlib.redirect_stdout(output), contextlib.redirect_stderr(output):
+        original_stdin, sys.stdin = sys.stdin, io.StringIO(stdin)
+        try:
+            function(*args)
+        finally:
+            sys.stdin = original_stdin
+    return output.getvalue()
+
+class TestStatistics(unittest.TestCase):
+    def test_status_counts_and_total_population(self):
+        species_data, new_species = create_test_species_data()
+        self.assertEqual(skeleton.calculate_status_counts(species_data),
+                         {"Endangered": 2, "Vulnerable": 2, "Critically Endangered": 1})
+        self.assertEqual(skeleton.calculate_total_population(species_data), 64550)
+        self.assertEqual(skeleton.calculate_status_counts({}), {})
+        self.assertEqual(skeleton.calculate_total_population({}), 0)
+
+class TestBatchMode(unittest.TestCase):
+    def test_statistics_commands_print_results(self):
+        species_data, new_species = create_test_species_data()
+        commands = [("status_counts", []), ("total_population", []),
+                    ("most_threatened", []), ("population_brackets", [])]
+        output = run_captured(skeleton.run_batch, commands, species_data, new_species)
+        self.assertIn("Vulnerable: 2", output)
+        self.assertIn("Total Population: 64,550", output)
+        self.assertIn("SP005 | Indian Vulture", output)
+        self.assertIn("Critical: SP004", output)
+
+    def test_updates_carry_over_and_errors_do_not_stop_the_batch(self):
+        species_data, new_species = create_test_species_data()
+        commands = [("update_population", ["SP004", "9000"]), ("bogus", []),
+                    ("merge", []), ("filter_population", ["8000", "10000"])]
+        result = {}
+        output = run_captured(lambda: result.update(skeleton.run_batch(commands, species_data, new_species)[0]))
+        self.assertIn("Error: Unknown command", output)
+        self.assertIn("SP004 | Snow Leopard", output)
+        self.assertEqual(len(result), 7)
+
+    def test_script_file_and_output_file(self):
+        with tempfile.TemporaryDirectory() as directory:
+            script = os.path.join(directory, "commands.txt")
+            report = os.path.join(directory, "report.txt")
+            with open(script, "w", encoding="utf-8") as script_file:
+                script_file.write("# statistics\n\ntotal_population\nsearch 'habitat loss'\n")
+            skeleton.run_batch_from_arguments(["--script", script, "--output", report, "status_counts"],
+                                              *create_test_species_data())
+            with open(report, encoding="utf-8") as report_file:
+                text = report_file.read()
+        self.assertIn("Total Population: 64,550", text)
+        self.assertIn(">>> search habitat loss", text)
+        self.assertIn("Command Timings:", text)
+
+    def test_blank_command_is_skipped(self):
+        output = run_captured(skeleton.run_batch_from_arguments, ["", "total_population"],
+                              *create_test_species_data())
+        self.assertIn("Total Population: 64,550", output)
+
+    def test_malformed_command_is_a_usage_error(self):
+        with self.assertRaises(SystemExit):
+            run_captured(skeleton.run_batch_from_arguments, ['search "unclosed'], *create_test_species_data())
+
+    def test_main_ignores_process_arguments(self):
+        original_argv = sys.argv
+        sys.argv = ["skeleton.py", "status_counts"]
+        try:
+            output = run_captured(skeleton.main, stdin="0\n")
+        finally:
+            sys.argv = original_argv
+        self.assertIn("Main Menu:", output)
+        self.assertNotIn(">>> status_counts", output)
+
+    def test_main_runs_batch_for_given_arguments(self):
+        output = run_captured(skeleton.main, ["total_population"])
+        self.assertIn(">>> total_population", output)
+        self.assertNotIn("Main Menu:", output)
+
+class TestStatisticsMenu(unittest.TestCase):
+    def test_memory_report_follows_the_template_statistics(self):
+        output = run_captured(skeleton.main, [], stdin="5\n2\n5\n5\n\n0\n")
+        self.assertIn("1. Status Counts", output)
+        self.assertIn("5. Memory Usage Report", output)
+        self.assertIn("Total Population: 0", output)
+        self.assertIn("Species: 0", output)
+        self.assertNotIn("Invalid choice", output)
+
+if __name__ == "__main__":
+    unittest.main()
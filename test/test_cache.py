@@ -0,0 +1,51 @@
+import functools
+import unittest
+import skeleton
+from test.species_fixtures import create_test_species_data
+
+class TestResultCache(unittest.TestCase):
+    def setUp(self):
+        self.cache = skeleton.ResultCache(max_entries=4)
+        skeleton.register_species_observer(self.cache)
+        self.addCleanup(skeleton.unregister_species_observer, self.cache)
+
+    def test_repeated_call_hits(self):
+        species_data, _ = create_test_species_data()
+        first = self.cache.call(skeleton.calculate_status_counts, species_data)
+        second = self.cache.call(skeleton.calculate_status_counts, species_data)
+        self.assertIs(first, second)
+        self.assertEqual(first, {"Endangered": 2, "Vulnerable": 2, "Critically Endangered": 1})
+        self.assertEqual((self.cache.stats()["hits"], self.cache.stats()["misses"]), (1, 1))
+
+    def test_distinct_functions_with_the_same_name_do_not_collide(self):
+        species_data, _ = create_test_species_data()
+        self.assertEqual(self.cache.call(lambda data: "A", species_data), "A")
+        self.assertEqual(self.cache.call(lambda data: "B", species_data), "B")
+
+    def test_partial_functions_are_supported(self):
+        species_data, _ = create_test_species_data()
+        forest = functools.partial(skeleton.filter_by_habitat_type, habitat_type="Forest")
+        self.assertEqual(list(self.cache.call(forest, species_data)), ["SP001", "SP002"])
+        self.assertEqual(self.cache.stats()["misses"], 1)
+
+    def test_updates_invalidate_entries(self):
+        species_data, _ = create_test_species_data()
+        self.cache.call(skeleton.calculate_total_population, species_data)
+        updated = skeleton.update_species_population(species_data, "SP004", 550)
+        self.assertEqual(self.cache.stats()["entries"], 0)
+        self.assertEqual(self.cache.call(skeleton.calculate_total_population, updated), 64650)
+
+    def test_least_recently_used_entries_are_evicted(self):
+        species_data, _ = create_test_species_data()
+        for low in range(6):
+            self.cache.call(skeleton.filter_by_population_range, species_data, low, 1000)
+        self.assertEqual(self.cache.stats()["entries"], 4)
+        self.assertEqual(self.cache.stats()["evictions"], 2)
+
+    def test_errors_are_not_cached(self):
+        with self.assertRaises(ValueError):
+            self.cache.call(skeleton.calculate_status_counts, None)
+        self.assertEqual(self.cache.stats()["entries"], 0)
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,262 @@
+import random
+import threading
+import unittest
+import skeleton
+from test.species_fixtures import create_test_species_data, create_unrelated_species_data
+
+class ObserverTestCase(unittest.TestCase):
+    """Registers observers for one test and always unregisters them afterwards."""
+
+    def register(self, observer):
+        skeleton.register_species_observer(observer)
+        self.addCleanup(skeleton.unregister_species_observer, observer)
+        return observer
+
+class TestPopulationSketch(unittest.TestCase):
+    def test_quantiles_within_relative_accuracy(self):
+        generator = random.Random(7)
+        populations = sorted(generator.randrange(1, 10 ** 6) for _ in range(5000))
+        sketch = skeleton.PopulationSketch(0.01)
+        for population in populations:
+            sketch.add(population)
+        for q in (0.1, 0.5, 0.99):
+            exact = populations[int(q * (len(populations) - 1))]
+            self.assertLessEqual(abs(sketch.quantile(q) - exact), 0.01 * exact)
+
+    def test_remove_merge_and_empty(self):
+        first, second = skeleton.PopulationSketch(), skeleton.PopulationSketch()
+        self.assertIsNone(first.quantile(0.5))
+        first.add(0)
+        second.add(100)
+        first.merge(second)
+        self.assertEqual(first.count, 2)
+        first.remove(0)
+        self.assertAlmostEqual(first.quantile(0), 100, delta=1)
+        with self.assertRaises(ValueError):
+            first.remove(0)
+        with self.assertRaises(ValueError):
+            first.merge(skeleton.PopulationSketch(0.05))
+
+class TestHyperLogLog(unittest.TestCase):
+    def test_estimate_within_a_few_standard_errors(self):
+        sketch = skeleton.HyperLogLog(12)
+        for number in range(20000):
+            sketch.add(f"threat-{number}")
+            sketch.add(f"threat-{number}")
+        self.assertLess(abs(sketch.count() - 20000) / 20000, 0.05)
+
+    def test_merge_counts_the_union(self):
+        first, second = skeleton.HyperLogLog(10), skeleton.HyperLogLog(10)
+        for number in range(300):
+            first.add(str(number))
+            second.add(str(number + 200))
+        first.merge(second)
+        self.assertLess(abs(first.count() - 500), 50)
+        self.assertEqual(skeleton.HyperLogLog().count(), 0)
+        with self.assertRaises(ValueError):
+            first.merge(skeleton.HyperLogLog(12))
+
+class TestRoaringBitmap(unittest.TestCase):
+    def test_set_operations_across_containers(self):
+        evens = skeleton.RoaringBitmap(range(0, 200000, 2))
+        small = skeleton.RoaringBitmap([1, 2, 3, 4, 70000, 150000])
+        self.assertEqual(list(evens & small), [2, 4, 70000, 150000])
+        self.assertEqual(len(evens | small), 100002)
+        self.assertEqual(list(small - evens), [1, 3])
+        small.discard(70000)
+        self.assertNotIn(70000, small)
+        self.assertEqual(len(skeleton.RoaringBitmap() & evens), 0)
+
+class TestLevenshteinDistance(unittest.TestCase):
+    def test_distances(self):
+        self.assertEqual(skeleton.levenshtein_distance("tiger", "tigre"), 2)
+        self.assertEqual(skeleton.levenshtein_distance("", "abc"), 3)
+        self.assertEqual(skeleton.levenshtein_distance("poaching", "poaching"), 0)
+
+class TestPopulationQuantileIndex(ObserverTestCase):
+    def test_follows_population_updates(self):
+        species_data, _ = create_test_species_data()
+        index = self.register(skeleton.PopulationQuantileIndex(species_data))
+        updated = skeleton.update_species_population(species_data, "SP004", 100000)
+        self.assertIsNotNone(updated)
+        self.assertAlmostEqual(index.quantile("habitat_type", "Mountain", 0.5), 100000, delta=1000)
+
+    def test_repeated_update_of_same_base_data(self):
+        species_data, _ = create_test_species_data()
+        index = self.register(skeleton.PopulationQuantileIndex(species_data))
+        skeleton.update_species_population(species_data, "SP001", 4000)
+        skeleton.update_species_population(species_data, "SP001", 5000)
+        self.assertEqual(index.groups["habitat_type"]["Forest"].count, 2)
+        self.assertAlmostEqual(index.quantile("habitat_type", "Forest", 0), 4000, delta=40)
+
+    def test_unrelated_dataset_is_ignored(self):
+        species_data, _ = create_test_species_data()
+        index = self.register(skeleton.PopulationQuantileIndex(species_data))
+        other = create_unrelated_species_data()
+        skeleton.update_species_population(other, "SP001", 1)
+        skeleton.update_conservation_status(other, "x1", "Vulnerable")
+        self.assertNotIn("Ocean", index.groups["habitat_type"])
+        self.assertEqual(index.groups["habitat_type"]["Forest"].count, 2)
+
+    def test_merge_adds_new_species(self):
+        species_data, new_species = create_test_species_data()
+        index = self.register(skeleton.PopulationQuantileIndex(species_data))
+        skeleton.merge_species_data(species_data, new_species)
+        self.assertAlmostEqual(index.quantile("habitat_type", "Wetland", 0.5), 3500, delta=35)
+
+    def test_merge_into_unrelated_dataset_is_ignored(self):
+        species_data, new_species = create_test_species_data()
+        index = self.register(skeleton.PopulationQuantileIndex(species_data))
+        skeleton.merge_species_data({}, {"NS001": create_unrelated_species_data()["x1"]})
+        skeleton.merge_species_data(create_unrelated_species_data(), new_species)
+        self.assertNotIn("Ocean", index.groups["habitat_type"])
+        self.assertNotIn("Wetland", index.groups["habitat_type"])
+        merged = skeleton.merge_species_data(species_data, new_species)
+        self.assertAlmostEqual(index.quantile("habitat_type", "Wetland", 0.5), 3500, delta=35)
+        skeleton.update_species_population(merged, "NS001", 4000)
+        self.assertAlmostEqual(index.quantile("habitat_type", "Wetland", 0.5), 4000, delta=40)
+
+    def test_index_built_from_empty_dataset_follows_its_merges(self):
+        species_data, new_species = create_test_species_data()
+        empty = {}
+        index = self.register(skeleton.PopulationQuantileIndex(empty))
+        skeleton.merge_species_data({}, species_data)
+        self.assertEqual(index.groups["habitat_type"], {})
+        merged = skeleton.merge_species_data(empty, new_species)
+        skeleton.merge_species_data(merged, species_data)
+        self.assertEqual(sum(sketch.count for sketch in index.groups["habitat_type"].values()), 7)
+
+class TestDistinctCountIndex(ObserverTestCase):
+    def test_counts_threats_added_after_build(self):
+        species_data, _ = create_test_species_data()
+        index = self.register(skeleton.DistinctCountIndex(species_data))
+        self.assertEqual(index.distinct_count("habitat_type", "Forest", "threats"), 3)
+        skeleton.add_species_threat(species_data, "SP001", "Disease")
+        self.assertEqual(index.distinct_count("habitat_type", "Forest", "threats"), 4)
+
+    def test_unrelated_dataset_is_ignored(self):
+        species_data, _ = create_test_species_data()
+        index = self.register(skeleton.DistinctCountIndex(species_data))
+        skeleton.add_species_threat(create_unrelated_species_data(), "SP001", "Whaling")
+        self.assertEqual(index.distinct_count("habitat_type", "Ocean", "threats"), 0)
+        self.assertEqual(index.distinct_count("habitat_type", "Forest", "threats"), 3)
+
+    def test_merge_into_unrelated_dataset_is_ignored(self):
+        species_data, new_species = create_test_species_data()
+        index = self.register(skeleton.DistinctCountIndex(species_data))
+        skeleton.merge_species_data({}, new_species)
+        self.assertEqual(index.distinct_count("habitat_type", "Wetland", "threats"), 0)
+        skeleton.merge_species_data(species_data, new_species)
+        self.assertEqual(index.distinct_count("habitat_type", "Wetland", "threats"), 3)
+
+class TestThreatBitmapIndex(ObserverTestCase):
+    def test_boolean_query_follows_new_threats(self):
+        species_data, _ = create_test_species_data()
+        index = self.register(skeleton.ThreatBitmapIndex(species_data))
+        updated = skeleton.add_species_threat(species_data, "SP004", "Flooding")
+        result = index.query(updated, all_of=["Poaching", "Flooding"], none_of=["Habitat Loss"])
+        self.assertEqual(list(result), ["SP004"])
+
+    def test_unrelated_dataset_is_ignored(self):
+        species_data, _ = create_test_species_data()
+        index = self.register(skeleton.ThreatBitmapIndex(species_data))
+        other = create_unrelated_species_data()
+        skeleton.add_species_threat(other, "SP001", "Whaling")
+        skeleton.merge_species_data(other, {"SP001": other["x1"]})
+        self.assertEqual(len(index.bitmap("Poaching")), 4)
+        self.assertEqual(len(index.bitmap("Whaling")), 0)
+
+class TestFuzzySearchIndex(ObserverTestCase):
+    def test_finds_misspelled_name(self):
+        species_data, _ = create_test_species_data()
+        index = skeleton.FuzzySearchIndex(species_data)
+        self.assertEqual(list(index.search(species_data, "tigre"))[0], "SP001")
+
+    def test_follows_updates_and_ignores_unrelated_dataset(self):
+        species_data, _ = create_test_species_data()
+        index = self.register(skeleton.FuzzySearchIndex(species_data))
+        skeleton.add_species_threat(create_unrelated_species_data(), "SP001", "Whaling")
+        updated = skeleton.add_species_threat(species_data, "SP004", "Avalanches")
+        self.assertEqual(list(index.search(updated, "avalanche", 1)), ["SP004"])
+        self.assertEqual(index.search(updated, "whaling", 0), {})
+
+class TestAutocompleteIndex(ObserverTestCase):
+    def test_completes_merged_species(self):
+        species_data, new_species = create_test_species_data()
+        index = self.register(skeleton.AutocompleteIndex(species_data))
+        skeleton.merge_species_data(species_data, new_species)
+        self.assertEqual(index.complete("ga", "name"), ["Ganges River Dolphin"])
+        self.assertEqual(index.complete("ns", "id"), ["NS001", "NS002"])
+
+    def test_unrelated_dataset_is_ignored(self):
+        species_data, _ = create_test_species_data()
+        index = self.register(skeleton.AutocompleteIndex(species_data))
+        skeleton.update_species_population(create_unrelated_species_data(), "x1", 10)
+        self.assertEqual(index.complete("x", "id"), [])
+        self.assertEqual(index.complete("sp", "id", limit=10), ["SP001", "SP002", "SP003", "SP004", "SP005"])
+
+    def test_removing_unknown_value_is_ignored(self):
+        species_data, _ = create_test_species_data()
+        index = skeleton.AutocompleteIndex(species_data)
+        index.remove_value("name", "Blue Whale")
+        self.assertEqual(index.complete("b", "name"), ["Bengal Tiger"])
+
+SANCTUARY_COORDINATES = {
+    "Sundarbans": (21.95, 89.18), "Jim Corbett": (29.53, 78.77), "Bandhavgarh": (23.72, 81.02),
+    "Kaziranga": (26.58, 93.17), "Manas": (26.72, 90.93), "Hemis": (33.91, 77.56),
+}
+
+class TestSanctuarySpatialIndex(ObserverTestCase):
+    def test_box_and_radius_queries(self):
+        species_data, _ = create_test_species_data()
+        index = skeleton.SanctuarySpatialIndex(SANCTUARY_COORDINATES, species_data)
+        self.assertEqual(sorted(index.sanctuaries_in_box(25, 88, 28, 94)), ["Kaziranga", "Manas"])
+        self.assertEqual([name for name, _ in index.sanctuaries_within("Kaziranga", 300)], ["Kaziranga", "Manas"])
+        self.assertEqual(list(index.species_in_box(species_data, 25, 88, 28, 94)), ["SP003"])
+
+    def test_radius_search_crosses_the_antimeridian(self):
+        coordinates = {"East": (0, 179.9), "West": (0, -179.9), "Far": (0, 170)}
+        index = skeleton.SanctuarySpatialIndex(coordinates, {})
+        self.assertEqual([name for name, _ in index.sanctuaries_within("East", 100)], ["East", "West"])
+        self.assertEqual([name for name, _ in index.sanctuaries_within("West", 100)], ["West", "East"])
+        self.assertAlmostEqual(index.sanctuaries_within("West", 100)[1][1], 22.2, delta=0.1)
+
+    def test_large_box_with_fine_grid_visits_only_occupied_cells(self):
+        species_data, _ = create_test_species_data()
+        index = skeleton.SanctuarySpatialIndex(SANCTUARY_COORDINATES, species_data, cell_size=0.0001)
+        self.assertEqual(len(index.sanctuaries_in_box(-90, -180, 90, 180)), len(SANCTUARY_COORDINATES))
+
+    def test_unrelated_dataset_is_ignored(self):
+        species_data, _ = create_test_species_data()
+        index = self.register(skeleton.SanctuarySpatialIndex(SANCTUARY_COORDINATES, species_data))
+        skeleton.update_species_population(create_unrelated_species_data(), "SP001", 1)
+        self.assertEqual(list(index.species_in_box(species_data, 21, 89, 22, 90)), ["SP001"])
+
+class TestChangeEvents(ObserverTestCase):
+    def test_callback_receives_field_events(self):
+        species_data, _ = create_test_species_data()
+        events = []
+        self.register(skeleton.subscribe_species_changes(events.append))
+        skeleton.update_species_population(species_data, "SP001", 4000)
+        self.assertEqual(events, [skeleton.SpeciesChangeEvent("SP001", "updated", "population", 3500, 4000)])
+
+    def test_full_queue_drops_without_blocking_by_default(self):
+        species_data, _ = create_test_species_data()
+        subscription = self.register(skeleton.subscribe_species_changes(maxsize=2))
+        worker = threading.Thread(target=lambda: [skeleton.update_species_population(species_data, "SP001", n)
+                                                  for n in range(5)])
+        worker.start()
+        worker.join(timeout=3)
+        self.assertFalse(worker.is_alive())
+        self.assertEqual(subscription.dropped, 3)
+        self.assertEqual(subscription.get(timeout=0).new_value, 0)
+
+    def test_blocking_is_opt_in(self):
+        species_data, _ = create_test_species_data()
+        subscription = self.register(skeleton.subscribe_species_changes(maxsize=1, timeout=0.01))
+        skeleton.update_species_population(species_data, "SP001", 1)
+        skeleton.update_species_population(species_data, "SP001", 2)
+        self.assertEqual(subscription.dropped, 1)
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,77 @@
+import unittest
+import skeleton
+from test.species_fixtures import create_test_species_data
+
+class TestParallelKeywordSearch(unittest.TestCase):
+    def setUp(self):
+        species_data, new_species = create_test_species_data()
+        self.species_data = skeleton.merge_species_data(species_data, new_species)
+        self.search = skeleton.ParallelKeywordSearch(self.species_data, workers=3)
+        self.addCleanup(self.search.close)
+
+    def test_matches_sequential_search(self):
+        for keyword in ["poach", "Habitat  LOSS", "panthera", "a", "zzz"]:
+            with self.subTest(keyword=keyword):
+                expected = skeleton.find_species_with_keyword(self.species_data, keyword)
+                self.assertEqual(list(self.search.search(self.species_data, keyword)), list(expected))
+
+    def test_empty_keyword_returns_every_species(self):
+        for keyword in ["", " ", "\t\n"]:
+            with self.subTest(keyword=keyword):
+                self.assertEqual(list(self.search.search(self.species_data, keyword)), list(self.species_data))
+
+    def test_keyword_cannot_match_across_records(self):
+        self.assertEqual(self.search.search(self.species_data, "conflict asian"), {})
+
+    def test_none_inputs_raise(self):
+        with self.assertRaises(ValueError):
+            self.search.search(None, "tiger")
+        with self.assertRaises(ValueError):
+            self.search.search(self.species_data, None)
+
+class TestShardedSpeciesStore(unittest.TestCase):
+    def setUp(self):
+        species_data, new_species = create_test_species_data()
+        self.species_data = skeleton.merge_species_data(species_data, new_species)
+
+    def assert_matches_single_dictionary(self, store):
+        queries = [("filter_by_conservation_status", "Endangered"), ("filter_by_population_range", 100, 5000),
+                   ("filter_by_habitat_type", "Grassland"), ("filter_by_sanctuary", "Jim Corbett"),
+                   ("find_species_with_keyword", "poaching"), ("calculate_status_counts",),
+                   ("calculate_total_population",), ("find_most_threatened_species",)]
+        for function_name, *args in queries:
+            with self.subTest(function=function_name, partition=store.partition):
+                expected = getattr(skeleton, function_name)(self.species_data, *args)
+                result = store.query(function_name, *args)
+                self.assertEqual(result, expected)
+                if isinstance(expected, dict):
+                    self.assertEqual(list(result), list(expected))
+
+    def test_worker_results_match_single_dictionary(self):
+        for partition in ("hash", "prefix"):
+            with skeleton.ShardedSpeciesStore(self.species_data, shard_count=3, partition=partition) as store:
+                self.assert_matches_single_dictionary(store)
+
+    def test_in_process_results_match_single_dictionary(self):
+        store = skeleton.ShardedSpeciesStore(self.species_data, shard_count=5, parallel=False)
+        self.assert_matches_single_dictionary(store)
+        self.assertEqual(store.query("calculate_total_population"), 68200)
+
+    def test_worker_errors_keep_the_store_usable(self):
+        with skeleton.ShardedSpeciesStore(self.species_data, shard_count=2) as store:
+            with self.assertRaises(ValueError):
+                store.query("filter_by_conservation_status", None)
+            with self.assertRaises(TypeError):
+                store.query("filter_by_population_range", 1)
+            self.assertEqual(store.query("calculate_total_population"), 68200)
+
+    def test_unsupported_function_and_empty_store(self):
+        with self.assertRaises(ValueError):
+            skeleton.ShardedSpeciesStore(self.species_data, parallel=False).query("merge_species_data", {})
+        empty = skeleton.ShardedSpeciesStore({}, parallel=False)
+        self.assertEqual(empty.query("calculate_status_counts"), {})
+        with self.assertRaises(ValueError):
+            empty.query("find_most_threatened_species")
+
+if __name__ == "__main__":
+    unittest.main()
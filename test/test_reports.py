@@ -0,0 +1,123 @@
+import threading
+import unittest
+import skeleton
+from test.species_fixtures import create_test_species_data
+
+class TestPopulationTrends(unittest.TestCase):
+    def test_growth_rolling_average_and_decline(self):
+        species_data = {
+            "A": {"population": 80, "population_history": [120, 100]},
+            "B": {"population": 110, "population_history": [100]},
+            "C": {"population": 50},
+        }
+        trends = skeleton.calculate_population_trends(species_data, window=2)
+        self.assertAlmostEqual(trends["A"]["growth_rate"], -0.2)
+        self.assertEqual(trends["A"]["rolling_average"], 90)
+        self.assertTrue(trends["A"]["declining"])
+        self.assertFalse(trends["B"]["declining"])
+        self.assertEqual(trends["C"], {"growth_rate": None, "rolling_average": 50, "declining": False})
+
+    def test_empty_data_and_invalid_arguments(self):
+        self.assertEqual(skeleton.calculate_population_trends({}), {})
+        with self.assertRaises(ValueError):
+            skeleton.calculate_population_trends({}, window=0)
+        with self.assertRaises(ValueError):
+            skeleton.calculate_population_trends({}, decline_threshold=-0.1)
+
+class TestPopulationBrackets(unittest.TestCase):
+    def test_default_brackets_include_upper_limits(self):
+        species_data = {f"T{number}": {"population": population} for number, population in
+                        enumerate([0, 500, 501, 5000, 5001, 20000, 20001])}
+        self.assertEqual(skeleton.create_population_brackets(species_data), {
+            "critical": ["T0", "T1"], "endangered": ["T2", "T3"],
+            "vulnerable": ["T4", "T5"], "stable": ["T6"]})
+
+    def test_custom_limits_keep_dataset_order(self):
+        species_data, _ = create_test_species_data()
+        brackets = skeleton.create_population_brackets(species_data, [3500], ["small", "large"])
+        self.assertEqual(brackets, {"small": ["SP001", "SP004"], "large": ["SP002", "SP003", "SP005"]})
+
+    def test_invalid_limits_raise(self):
+        species_data, _ = create_test_species_data()
+        with self.assertRaises(ValueError):
+            skeleton.create_population_brackets(species_data, [100, 10], ["a", "b", "c"])
+        with self.assertRaises(ValueError):
+            skeleton.create_population_brackets(species_data, [100], ["a"])
+        with self.assertRaises(ValueError):
+            skeleton.create_population_brackets(None)
+
+class TestThreatScoring(unittest.TestCase):
+    def test_status_dominates_by_default(self):
+        species_data = {
+            "V1": {"conservation_status": "Vulnerable", "population": 2, "threats": ["a", "b", "c"],
+                   "sanctuaries": [], "population_history": [1000]},
+            "C1": {"conservation_status": "Critically Endangered", "population": 10 ** 6, "threats": ["a"],
+                   "sanctuaries": ["x", "y", "z"]},
+        }
+        scores = skeleton.ThreatScoringModel().score(species_data)
+        self.assertGreater(scores["C1"], scores["V1"])
+        self.assertEqual(skeleton.find_most_threatened_species(species_data)[0], "C1")
+
+    def test_top_species_agree_with_most_threatened(self):
+        species_data, new_species = create_test_species_data()
+        merged = skeleton.merge_species_data(species_data, new_species)
+        top = skeleton.ThreatScoringModel().top(merged, limit=2)
+        self.assertEqual(list(top)[0], skeleton.find_most_threatened_species(merged)[0])
+
+    def test_custom_features_and_invalid_weights(self):
+        species_data, _ = create_test_species_data()
+        model = skeleton.ThreatScoringModel(weights={"forest": 1.0},
+                                            features={"forest": lambda species_list: [
+                                                float(species["habitat_type"] == "Forest") for species in species_list]})
+        self.assertEqual(model.score(species_data), {"SP001": 1.0, "SP002": 1.0, "SP003": 0.0,
+                                                     "SP004": 0.0, "SP005": 0.0})
+        with self.assertRaises(ValueError):
+            skeleton.ThreatScoringModel(weights={"unknown": 1.0})
+        with self.assertRaises(ValueError):
+            skeleton.ThreatScoringModel(weights={"status": -1.0})
+
+class TestMemoryReport(unittest.TestCase):
+    def test_report_accounts_for_every_field(self):
+        species_data, _ = create_test_species_data()
+        report = skeleton.build_memory_report(species_data, structures={})
+        self.assertEqual(report["species_count"], 5)
+        self.assertEqual(set(report["field_bytes"]), set(species_data["SP001"]))
+        self.assertGreaterEqual(report["species_bytes"], sum(report["field_bytes"].values()))
+        self.assertEqual(len(report["largest_species"]), 5)
+
+    def test_structures_do_not_count_shared_records_again(self):
+        species_data, _ = create_test_species_data()
+        holder = {"records": dict(species_data)}
+        report = skeleton.build_memory_report(species_data, structures={"holder": holder})
+        self.assertLess(report["structure_bytes"]["holder"], report["species_bytes"] / 2)
+
+    def test_threads_and_locks_are_fixed_overhead(self):
+        species_data, _ = create_test_species_data()
+        manager = skeleton.SpeciesIndexManager()
+        manager.warm_up(species_data)
+        manager.wait()
+        growth, fixed = skeleton.measure_sizeof(manager, set())
+        _, thread_bytes = skeleton.measure_sizeof(manager.thread, set())
+        self.assertGreater(growth, 0)
+        self.assertGreaterEqual(fixed, thread_bytes)
+
+    def test_projection_does_not_scale_fixed_overhead(self):
+        species_data, _ = create_test_species_data()
+        structure = threading.Thread(target=lambda: None)
+        report = skeleton.build_memory_report(species_data, structures={"runtime": structure},
+                                              target_count=5000)
+        fixed = report["structure_fixed_bytes"]["runtime"]
+        self.assertEqual(report["structure_bytes"]["runtime"], fixed)
+        self.assertEqual(report["projected_bytes"], report["species_bytes"] * 1000 + fixed)
+
+    def test_empty_data_and_invalid_target(self):
+        report = skeleton.build_memory_report({}, structures={}, target_count=100)
+        self.assertEqual(report["bytes_per_species"], 0.0)
+        self.assertEqual(report["projected_bytes"], 0)
+        with self.assertRaises(ValueError):
+            skeleton.build_memory_report(None)
+        with self.assertRaises(ValueError):
+            skeleton.build_memory_report({}, target_count=-1)
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,263 @@
+import csv
+import json
+import os
+import pickle
+import tempfile
+import unittest
+import skeleton
+from test.species_fixtures import create_test_species_data
+
+class TestSearchTextCache(unittest.TestCase):
+    def test_keyword_search_sees_updates(self):
+        species_data, _ = create_test_species_data()
+        self.assertEqual(list(skeleton.find_species_with_keyword(species_data, "  TIGER ")), ["SP001"])
+        updated = skeleton.add_species_threat(species_data, "SP004", "Tiger Competition")
+        self.assertEqual(list(skeleton.find_species_with_keyword(updated, "tiger")), ["SP001", "SP004"])
+        self.assertEqual(skeleton.find_species_with_keyword(species_data, "conflict asian"), {})
+
+class TestSanctuaryIncidenceMatrix(unittest.TestCase):
+    def test_shared_counts_and_cover(self):
+        species_data, _ = create_test_species_data()
+        species_data["SP002"] = {**species_data["SP002"], "sanctuaries": ["Periyar", "Jim Corbett", "Bandhavgarh"]}
+        matrix = skeleton.SanctuaryIncidenceMatrix(species_data)
+        self.assertEqual(matrix.shared_species_counts(limit=1), [(("Jim Corbett", "Bandhavgarh"), 2)])
+        self.assertEqual(matrix.shared_species_counts(["SP003"], limit=1)[0][1], 1)
+        chosen, uncovered = matrix.greedy_sanctuary_cover()
+        self.assertEqual(chosen[0], "Bandhavgarh")
+        covered = {sid for sid, species in species_data.items() if set(species["sanctuaries"]) & set(chosen)}
+        self.assertEqual(covered, set(species_data))
+        self.assertEqual(uncovered, [])
+
+    def test_species_without_sanctuaries_are_uncovered(self):
+        species_data, _ = create_test_species_data()
+        species_data["SP004"] = {**species_data["SP004"], "sanctuaries": []}
+        chosen, uncovered = skeleton.SanctuaryIncidenceMatrix(species_data).greedy_sanctuary_cover()
+        self.assertEqual(uncovered, ["SP004"])
+
+class TestSpeciesPager(unittest.TestCase):
+    def test_pages_cover_every_species_once(self):
+        species_data, new_species = create_test_species_data()
+        pager = skeleton.SpeciesPager(skeleton.merge_species_data(species_data, new_species))
+        seen, cursor = [], None
+        while True:
+            page, cursor = pager.page(cursor, page_size=3)
+            seen.extend(page)
+            if cursor is None:
+                break
+        self.assertEqual(seen, ["NS001", "NS002", "SP001", "SP002", "SP003", "SP004", "SP005"])
+
+    def test_empty_data_and_invalid_page_size(self):
+        self.assertEqual(skeleton.SpeciesPager({}).page(), ({}, None))
+        with self.assertRaises(ValueError):
+            skeleton.SpeciesPager({}).page(page_size=0)
+
+class TestSpeciesIndexManager(unittest.TestCase):
+    def test_filters_match_scans_once_indexes_are_ready(self):
+        species_data, _ = create_test_species_data()
+        expected = {
+            "status": skeleton.filter_by_conservation_status(species_data, "Vulnerable"),
+            "range": skeleton.filter_by_population_range(species_data, 450, 3600),
+            "habitat": skeleton.filter_by_habitat_type(species_data, "Grassland"),
+            "sanctuary": skeleton.filter_by_sanctuary(species_data, "Jim Corbett"),
+        }
+        skeleton.index_manager.warm_up(species_data)
+        skeleton.index_manager.wait()
+        self.addCleanup(skeleton.index_manager.warm_up, {})
+        self.assertIsNotNone(skeleton.index_manager.ready_index(species_data, "population"))
+        self.assertEqual(skeleton.filter_by_conservation_status(species_data, "Vulnerable"), expected["status"])
+        self.assertEqual(skeleton.filter_by_population_range(species_data, 450, 3600), expected["range"])
+        self.assertEqual(skeleton.filter_by_habitat_type(species_data, "Grassland"), expected["habitat"])
+        self.assertEqual(skeleton.filter_by_sanctuary(species_data, "Jim Corbett"), expected["sanctuary"])
+        self.assertIsNone(skeleton.index_manager.ready_index(dict(species_data), "population"))
+
+    def test_in_place_changes_fall_back_to_scanning(self):
+        species_data, _ = create_test_species_data()
+        skeleton.index_manager.warm_up(species_data)
+        skeleton.index_manager.wait()
+        self.addCleanup(skeleton.index_manager.warm_up, {})
+        species_data["SP001"] = {**species_data["SP001"], "conservation_status": "Least Concern", "population": 9}
+        del species_data["SP003"]
+        self.assertIsNone(skeleton.index_manager.ready_index(species_data, "conservation_status"))
+        self.assertEqual(list(skeleton.filter_by_conservation_status(species_data, "Least Concern")), ["SP001"])
+        self.assertEqual(list(skeleton.filter_by_conservation_status(species_data, "Endangered")), ["SP002"])
+        self.assertEqual(list(skeleton.filter_by_habitat_type(species_data, "Grassland")), ["SP005"])
+        self.assertEqual(list(skeleton.filter_by_population_range(species_data, 0, 500)), ["SP001", "SP004"])
+        skeleton.index_manager.wait()
+        self.assertIsNotNone(skeleton.index_manager.ready_index(species_data, "habitat_type"))
+        self.assertEqual(list(skeleton.filter_by_habitat_type(species_data, "Grassland")), ["SP005"])
+        self.assertEqual(list(skeleton.filter_by_sanctuary(species_data, "Kaziranga")), [])
+
+class TestSpeciesDiffs(unittest.TestCase):
+    def test_diff_and_replay_round_trip(self):
+        species_data, new_species = create_test_species_data()
+        updated = skeleton.update_species_population(species_data, "SP001", 3700)
+        updated = skeleton.add_species_threat(updated, "SP003", "Drought")
+        updated = skeleton.merge_species_data(updated, new_species)
+        diff = skeleton.diff_species_data(species_data, updated)
+        self.assertEqual(diff["changed"]["SP001"], {"population": (3500, 3700)})
+        self.assertEqual(set(diff["added"]), {"NS001", "NS002"})
+        self.assertEqual(skeleton.apply_species_diff(species_data, diff), updated)
+
+    def test_change_log_diff_since(self):
+        species_data, _ = create_test_species_data()
+        log = skeleton.SpeciesChangeLog(species_data)
+        skeleton.register_species_observer(log)
+        self.addCleanup(skeleton.unregister_species_observer, log)
+        updated = skeleton.update_species_population(species_data, "SP002", 26000)
+        version = log.version
+        final = skeleton.update_conservation_status(updated, "SP002", "Vulnerable")
+        self.assertEqual(log.diff_since(version), skeleton.diff_species_data(updated, final))
+        with self.assertRaises(ValueError):
+            log.diff_since(version + 5)
+
+    def test_change_log_ignores_other_datasets(self):
+        species_data, new_species = create_test_species_data()
+        log = skeleton.SpeciesChangeLog(species_data)
+        skeleton.register_species_observer(log)
+        self.addCleanup(skeleton.unregister_species_observer, log)
+        other, _ = create_test_species_data()
+        skeleton.update_species_population(other, "SP002", 1)
+        skeleton.merge_species_data({}, new_species)
+        skeleton.update_species_population(species_data, "SP002", 26000)
+        skeleton.update_species_population(species_data, "SP002", 25000)
+        self.assertEqual(log.version, 1)
+        self.assertEqual(log.diff_since(0)["changed"], {"SP002": {"population": (27000, 26000)}})
+
+class TestSharedOrderedSet(unittest.TestCase):
+    def test_versions_share_storage_but_stay_unchanged(self):
+        first = skeleton.SharedOrderedSet(["Poaching", "Flooding", "Poaching"])
+        second = first.with_value("Drought")
+        branch = first.with_value("Disease")
+        self.assertEqual(first, ["Poaching", "Flooding"])
+        self.assertEqual(second, ["Poaching", "Flooding", "Drought"])
+        self.assertEqual(branch, ["Poaching", "Flooding", "Disease"])
+        self.assertNotIn("Drought", first)
+        self.assertIs(first.with_value("Poaching"), first)
+
+    def test_large_sets_share_positions_between_versions(self):
+        first = skeleton.SharedOrderedSet(f"threat {number}" for number in range(20))
+        second = first.with_value("Drought")
+        branch = first.with_value("Disease")
+        self.assertIs(second.positions, first.positions)
+        self.assertIsNot(branch.positions, first.positions)
+        self.assertNotIn("Drought", first)
+        self.assertIn("Drought", second)
+        self.assertNotIn("Drought", branch)
+        self.assertEqual(branch[-1], "Disease")
+        self.assertEqual(second[20], "Drought")
+
+    def test_behaves_as_a_read_only_list(self):
+        species_data, _ = create_test_species_data()
+        updated = skeleton.add_species_threat(species_data, "SP001", "Disease")
+        threats = updated["SP001"]["threats"]
+        self.assertIsInstance(threats, list)
+        self.assertEqual(json.loads(json.dumps(updated))["SP001"]["threats"][-1], "Disease")
+        self.assertIsNone(threats.positions)
+        with self.assertRaises(TypeError):
+            threats.append("Drought")
+        with self.assertRaises(TypeError):
+            threats[0] = "Drought"
+
+    def test_pickles_visible_items_only(self):
+        values = skeleton.SharedOrderedSet(["a"]).with_value("b")
+        self.assertEqual(pickle.loads(pickle.dumps(values)), ["a", "b"])
+
+    def test_add_species_threat_keeps_earlier_versions(self):
+        species_data, _ = create_test_species_data()
+        updated = skeleton.add_species_threat(species_data, "SP001", "Disease")
+        again = skeleton.add_species_threat(species_data, "SP001", "Drought")
+        self.assertEqual(species_data["SP001"]["threats"], ["Poaching", "Habitat Loss", "Human Conflict"])
+        self.assertEqual(updated["SP001"]["threats"][-1], "Disease")
+        self.assertEqual(again["SP001"]["threats"][-1], "Drought")
+        self.assertNotIn("Disease", again["SP001"]["threats"])
+
+class TestStatusCodes(unittest.TestCase):
+    def test_status_names_are_kept_and_validated(self):
+        species_data, _ = create_test_species_data()
+        updated = skeleton.update_conservation_status(species_data, "SP004", "Near Threatened")
+        self.assertEqual(updated["SP004"]["conservation_status"], "Near Threatened")
+        with self.assertRaises(ValueError):
+            skeleton.update_conservation_status(species_data, "SP004", "Extinct")
+
+    def test_filter_indexes_are_keyed_by_integer_codes(self):
+        species_data, _ = create_test_species_data()
+        species_data["SP004"] = {**species_data["SP004"], "habitat_type": "Tundra"}
+        skeleton.index_manager.warm_up(species_data)
+        skeleton.index_manager.wait()
+        self.addCleanup(skeleton.index_manager.warm_up, {})
+        status_index = skeleton.index_manager.ready_index(species_data, "conservation_status")
+        habitat_index = skeleton.index_manager.ready_index(species_data, "habitat_type")
+        self.assertEqual(status_index[skeleton.STATUS_CODES["Vulnerable"]], ["SP003", "SP004"])
+        self.assertEqual(skeleton.HABITAT_TYPES[skeleton.habitat_code("Tundra")], "Tundra")
+        self.assertEqual(habitat_index[skeleton.habitat_code("Tundra")], ["SP004"])
+        self.assertEqual(list(skeleton.filter_by_habitat_type(species_data, "Tundra")), ["SP004"])
+        self.assertEqual(list(skeleton.filter_by_conservation_status(species_data, "Vulnerable")), ["SP003", "SP004"])
+        self.assertEqual(skeleton.filter_by_habitat_type(species_data, "Ocean"), {})
+        self.assertEqual(skeleton.filter_by_conservation_status(species_data, "Extinct"), {})
+
+class TestRankSpecies(unittest.TestCase):
+    def test_rank_species_orders_like_find_most_threatened(self):
+        species_data, new_species = create_test_species_data()
+        merged = skeleton.merge_species_data(species_data, new_species)
+        ranked = [sid for sid, _ in skeleton.rank_species(merged)]
+        self.assertEqual(ranked, ["NS002", "SP005", "SP001", "NS001", "SP002", "SP004", "SP003"])
+        self.assertEqual(ranked[0], skeleton.find_most_threatened_species(merged)[0])
+        least = [sid for sid, _ in skeleton.rank_species(merged, limit=2, order="least_threatened")]
+        self.assertEqual(least, ["SP003", "SP004"])
+        self.assertEqual(skeleton.rank_species({}), [])
+
+class TestExportAndSnapshots(unittest.TestCase):
+    def setUp(self):
+        species_data, new_species = create_test_species_data()
+        self.species_data = skeleton.merge_species_data(species_data, new_species)
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.directory = directory.name
+
+    def test_export_formats_round_trip(self):
+        for file_format in ("csv", "jsonl", "columnar"):
+            with self.subTest(file_format=file_format):
+                path = os.path.join(self.directory, f"species.{file_format}")
+                self.assertEqual(skeleton.export_species(self.species_data, path, file_format, chunk_size=3), 7)
+                if file_format == "columnar":
+                    rows = dict(skeleton.read_columnar_export(path))
+                    self.assertEqual(rows["NS002"]["threats"], ["Habitat Loss", "Power Lines", "Predation"])
+                    self.assertEqual(rows["SP004"]["population"], 450)
+                elif file_format == "csv":
+                    with open(path, newline="", encoding="utf-8") as export_file:
+                        rows = list(csv.reader(export_file))
+                    self.assertEqual(len(rows), 8)
+                else:
+                    with open(path, encoding="utf-8") as export_file:
+                        rows = [json.loads(line) for line in export_file]
+                    self.assertEqual(len(rows), 7)
+
+    def test_export_rejects_bad_arguments(self):
+        path = os.path.join(self.directory, "species.out")
+        with self.assertRaises(ValueError):
+            skeleton.export_species(self.species_data, path, "xml")
+        with self.assertRaises(ValueError):
+            skeleton.export_species(self.species_data, path, "csv", chunk_size=0)
+
+    def test_snapshot_random_access(self):
+        for compression in ("zlib", "lzma"):
+            with self.subTest(compression=compression):
+                path = os.path.join(self.directory, f"species.{compression}")
+                self.assertEqual(skeleton.write_species_snapshot(self.species_data, path, 2, compression), 4)
+                reader = skeleton.SpeciesSnapshotReader(path)
+                self.assertEqual(reader.get("SP003")["name"], "Indian Rhinoceros")
+                self.assertIsNone(reader.get("SP999"))
+                self.assertEqual(list(reader.load_range("SP002", "SP004")), ["SP002", "SP003", "SP004"])
+                self.assertEqual(reader.load_all(), {sid: self.species_data[sid] for sid in sorted(self.species_data)})
+
+    def test_snapshot_of_empty_data_and_bad_file(self):
+        path = os.path.join(self.directory, "empty.snap")
+        skeleton.write_species_snapshot({}, path)
+        self.assertEqual(skeleton.SpeciesSnapshotReader(path).load_all(), {})
+        with open(path, "wb") as snapshot_file:
+            snapshot_file.write(b"not a snapshot")
+        with self.assertRaises(ValueError):
+            skeleton.SpeciesSnapshotReader(path)
+
+if __name__ == "__main__":
+    unittest.main()